@@ -0,0 +1,69 @@
+import os
+
+from fastapi import HTTPException, Request
+
+from app.services.rate_limit import (
+    AdmissionController,
+    Overloaded,
+    RateLimitExceeded,
+    TokenBucketLimiter,
+    retry_after_header
+)
+
+ai_rate_limiter = TokenBucketLimiter(
+    per_minute=float(os.getenv("AI_RATE_LIMIT_PER_MINUTE", "20")),
+    burst=int(os.getenv("AI_RATE_LIMIT_BURST", "5"))
+)
+
+ai_admission = AdmissionController(
+    max_concurrent=int(os.getenv("AI_MAX_CONCURRENT_CALLS", "16")),
+    max_queued=int(os.getenv("AI_MAX_QUEUED_CALLS", "32")),
+    queue_timeout=float(os.getenv("AI_QUEUE_TIMEOUT_SECONDS", "5")),
+    max_loop_lag=float(os.getenv("AI_MAX_LOOP_LAG_MS", "200")) / 1000
+)
+
+
+def client_key(request: Request) -> str:
+    """
+    Identify the caller for rate limiting.
+
+    Behind a load balancer or reverse proxy, request.client is the proxy
+    unless uvicorn trusts its X-Forwarded-For header. Set FORWARDED_ALLOW_IPS
+    to the proxy addresses (uvicorn --proxy-headers --forwarded-allow-ips),
+    otherwise every user shares one bucket.
+
+    TODO: Key by user_id from the auth context once authentication is added,
+    falling back to the client IP for anonymous requests.
+    """
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def guard_ai_endpoint(request: Request):
+    """
+    Rate limit and admission control for endpoints that call the model.
+
+    Returns 429 when the caller is over their rate limit and 503 when the
+    server sheds load, both with Retry-After. Shed requests get their rate
+    limit token back. The admission slot is held until the endpoint
+    finishes.
+    """
+    key = client_key(request)
+    try:
+        await ai_rate_limiter.check(key)
+    except RateLimitExceeded as exc:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please slow down.",
+            headers={"Retry-After": retry_after_header(exc.retry_after)}
+        )
+
+    try:
+        async with ai_admission.admit():
+            yield
+    except Overloaded as exc:
+        await ai_rate_limiter.refund(key)
+        raise HTTPException(
+            status_code=503,
+            detail=exc.reason,
+            headers={"Retry-After": retry_after_header(exc.retry_after)}
+        )
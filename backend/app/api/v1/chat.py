@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+from app.services.chat_history import chat_history_buffer, decode_cursor, encode_cursor
+from app.api.dependencies import guard_ai_endpoint
 
 router = APIRouter()
 
@@ -17,11 +19,17 @@ class ChatResponse(BaseModel):
     session_id: str
 
 class ChatMessage(BaseModel):
+    message_id: Optional[str] = None
     timestamp: str
     role: str
     content: str
 
-@router.post("/chat/ask", response_model=ChatResponse)
+class ChatHistory(BaseModel):
+    session_id: str
+    messages: List[ChatMessage]
+    next_cursor: Optional[str] = None
+
+@router.post("/chat/ask", response_model=ChatResponse, dependencies=[Depends(guard_ai_endpoint)])
 async def chat_ask_question(data: ChatRequest):
     """
     Context-aware Q&A using medical history and Gemini AI.
@@ -53,6 +61,12 @@ async def chat_ask_question(data: ChatRequest):
     9. Save conversation to database:
        - Create or update session
        - Store both question and answer
+       - Add the inserted rows to the recent-history buffer with
+         message_from_row (app.services.chat_history), which keeps the
+         database's id and created_at so history cursors stay valid:
+         for row in inserted_rows:
+             chat_history_buffer.append(session_id, message_from_row(row),
+                                        new_session=data.session_id is None)
     10. Return formatted response with metadata
 
     Example Gemini prompt structure:
@@ -106,37 +120,86 @@ async def chat_ask_question(data: ChatRequest):
         session_id=session_id
     )
 
-@router.get("/chat/history/{session_id}")
-async def get_chat_history(session_id: str):
+@router.get("/chat/history/{session_id}", response_model=ChatHistory)
+async def get_chat_history(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = None
+):
     """
-    Retrieve conversation history for a session.
+    Retrieve conversation history for a session, newest message first.
+
+    Pagination is cursor based: pass the returned next_cursor as `before`
+    to fetch the next older page. next_cursor is null on the last page.
+    Pages inside the session's in-memory buffer of recent messages are
+    served without a database round trip.
 
-    TODO: Retrieve conversation history
+    TODO: Verify access, then retrieve conversation history on buffer miss
     Steps to implement:
-    1. Query database for session by session_id
-    2. Verify user has access to this session
-    3. Get all messages for this session ordered by timestamp
-    4. Return formatted conversation history
-    5. If session not found, return empty history
-
-    Example query:
-    SELECT * FROM chat_messages
-    WHERE session_id = ?
-    ORDER BY timestamp ASC
+    1. Before reading the buffer, verify the user owns the session
+       (chat_sessions.user_id = user_id); the buffer is keyed by session_id
+       only, so this check must run on buffer hits too. If the session is
+       not found or belongs to another user, return empty history.
+    On buffer miss:
+    2. Fetch limit + 1 messages older than the cursor, newest first
+       (served by idx_chat_messages_session_created)
+    3. If more than limit rows came back, set next_cursor from the last
+       message returned
+    4. Seed the buffer with the first page via
+       chat_history_buffer.load(session_id, [message_from_row(row) for row in rows], complete)
+
+    Example Supabase query:
+    supabase.table('chat_messages')
+        .select('id, role, content, created_at')
+        .eq('session_id', session_id)
+        .or_(f'created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{message_id})')  # if before
+        .order('created_at', desc=True)
+        .order('id', desc=True)
+        .limit(limit + 1)
     """
 
-    return {
-        "session_id": session_id,
-        "messages": [
-            ChatMessage(
-                timestamp=datetime.now().isoformat(),
-                role="user",
-                content="What is my hemoglobin level?"
-            ),
-            ChatMessage(
-                timestamp=datetime.now().isoformat(),
-                role="assistant",
-                content="Your latest hemoglobin level is 12.5 g/dL from your blood test on October 25, 2024. This is within the normal range."
-            )
-        ]
-    }
+    cursor = None
+    if before is not None:
+        try:
+            cursor = decode_cursor(before)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # TODO: Step 1 (session ownership check) goes here, before the buffer.
+    cached = chat_history_buffer.page(session_id, limit, cursor)
+    if cached is not None:
+        messages, next_cursor = cached
+        return ChatHistory(
+            session_id=session_id,
+            messages=[ChatMessage(**message) for message in messages],
+            next_cursor=next_cursor
+        )
+
+    now = datetime.now(timezone.utc).isoformat()
+    messages = [
+        ChatMessage(
+            message_id="MSG_002",
+            timestamp=now,
+            role="assistant",
+            content="Your latest hemoglobin level is 12.5 g/dL from your blood test on October 25, 2024. This is within the normal range."
+        ),
+        ChatMessage(
+            message_id="MSG_001",
+            timestamp=now,
+            role="user",
+            content="What is my hemoglobin level?"
+        )
+    ]
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_cursor(messages[-1].timestamp, messages[-1].message_id)
+
+    if cursor is None:
+        chat_history_buffer.load(
+            session_id,
+            [message.model_dump() for message in messages],
+            complete=next_cursor is None
+        )
+
+    return ChatHistory(session_id=session_id, messages=messages, next_cursor=next_cursor)
@@ -1,14 +1,40 @@
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import os
+from app.services.previews import (
+    DEFAULT_PREVIEW_SIZE,
+    PREVIEW_MEDIA_TYPE,
+    PREVIEW_SIZES,
+    PreviewError,
+    blob_path,
+    get_preview_manifest,
+    render_previews
+)
+from app.services.record_codec import (
+    compress_text,
+    decode_parsed_data,
+    encode_parsed_data,
+    stored_extracted_text,
+    to_bytea
+)
 
 router = APIRouter()
 
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./data/uploads")
+ALLOWED_UPLOAD_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png")
+PREVIEW_CACHE_CONTROL = "private, max-age=86400"
+RECORD_DETAIL_COLUMNS = "id, record_type, report_date, lab_name, parsed_data, status"
+RECORD_DETAIL_INCLUDES = {"text"}
+RECORD_TEXT_COLUMNS = ", extracted_text, extracted_text_compressed"
+
 class TestData(BaseModel):
     value: float
     unit: str
-    normal_range: List[float]
+    normal_range: Optional[List[float]] = None
     status: str
 
 class MedicalRecord(BaseModel):
@@ -24,7 +50,7 @@ class RecordDetails(BaseModel):
     record_type: str
     report_date: str
     lab_name: str
-    extracted_text: str
+    extracted_text: Optional[str] = None
     parsed_data: Dict[str, TestData]
     analysis: Dict[str, Any]
 
@@ -53,10 +79,15 @@ async def upload_medical_record(
        - Match against common medical test ranges
     6. Store record metadata in Supabase database:
        - record_id, record_type, report_date, lab_name
-       - file_path, extracted_text, parsed_data
-       - notes, created_at, updated_at
-    7. Calculate initial status (NORMAL/MONITOR/URGENT)
-    8. Return structured data with parsed medical values
+       - file_path, notes, created_at, updated_at
+       - extracted_text_compressed: to_bytea(compress_text(extracted_text))
+       - parsed_data: encode_parsed_data(parsed_data)
+    7. Calculate initial status (NORMAL/MONITOR/URGENT) and health score:
+       - overall_health_score, status = score_record(parsed_data)
+       - Store both along with scoring_version = DEFAULT_RULES.version
+    8. Render first-page previews for the Reports and ReportDetail pages:
+       - await run_in_threadpool(render_previews, record_id, file_path)
+    9. Return structured data with parsed medical values
 
     Example regex patterns:
     - Test name: r"([A-Za-z\s]+):\s*(\d+\.?\d*)\s*([a-zA-Z/]+)"
@@ -70,7 +101,7 @@ async def upload_medical_record(
         report_date DATE,
         lab_name VARCHAR,
         file_path VARCHAR,
-        extracted_text TEXT,
+        extracted_text_compressed BYTEA,
         parsed_data JSONB,
         notes TEXT,
         status VARCHAR,
@@ -152,10 +183,13 @@ async def get_medical_records(
     }
 
 @router.get("/records/{record_id}", response_model=RecordDetails)
-async def get_record_details(record_id: str):
+async def get_record_details(record_id: str, include: Optional[str] = None):
     """
     Retrieve detailed information for a specific record.
 
+    The OCR text is large and not shown by default, so it is only selected
+    and returned when requested with `?include=text`.
+
     TODO: Implement database lookup
     Steps to implement:
     1. Query Supabase for record by record_id
@@ -163,32 +197,48 @@ async def get_record_details(record_id: str):
     3. Load file content if needed
     4. Return full record details including:
        - Metadata (type, date, lab)
-       - Extracted text
-       - Parsed medical values
+       - Extracted text if requested: stored_extracted_text(row), which
+         decodes extracted_text_compressed and falls back to the plain
+         extracted_text of rows not yet compressed
+       - Parsed medical values: decode_parsed_data(parsed_data)
        - Previous analysis results
     5. If not found, return 404 error
 
     Example query:
     supabase.table('medical_records')
-        .select('*')
+        .select(RECORD_DETAIL_COLUMNS + (RECORD_TEXT_COLUMNS if 'text' in includes else ''))
         .eq('record_id', record_id)
         .eq('user_id', user_id)
         .single()
     """
 
+    includes = set(include.split(",")) if include else set()
+    unknown = includes - RECORD_DETAIL_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+
+    stored_parsed_data = encode_parsed_data({
+        "Hemoglobin": {
+            "value": 12.5,
+            "unit": "g/dL",
+            "normal_range": [12.0, 16.0],
+            "status": "NORMAL"
+        }
+    })
+    row = {
+        "extracted_text": None,
+        "extracted_text_compressed": to_bytea(compress_text("Complete Blood Count Report..."))
+    }
+
     return RecordDetails(
         record_id=record_id,
         record_type="Blood Test",
         report_date="2024-10-25",
         lab_name="Apollo Diagnostics",
-        extracted_text="Complete Blood Count Report...",
+        extracted_text=stored_extracted_text(row) if "text" in includes else None,
         parsed_data={
-            "Hemoglobin": TestData(
-                value=12.5,
-                unit="g/dL",
-                normal_range=[12.0, 16.0],
-                status="NORMAL"
-            )
+            name: TestData(**test)
+            for name, test in decode_parsed_data(stored_parsed_data).items()
         },
         analysis={
             "simple_explanation": "Your blood test shows normal values across all parameters",
@@ -197,3 +247,73 @@ async def get_record_details(record_id: str):
             "recommendations": ["Continue healthy lifestyle", "Retest in 6 months"]
         }
     )
+
+def _find_uploaded_file(record_id: str) -> Optional[str]:
+    """
+    Locate a record's uploaded file for preview backfill.
+
+    TODO: Replace with the record's file_path from the database lookup
+    described in get_record_preview; until then try each allowed extension.
+    """
+    for extension in ALLOWED_UPLOAD_EXTENSIONS:
+        file_path = os.path.join(UPLOAD_DIR, f"{record_id}{extension}")
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+@router.get("/records/{record_id}/preview")
+async def get_record_preview(
+    record_id: str,
+    size: str = Query(DEFAULT_PREVIEW_SIZE),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Serve a first-page thumbnail of an uploaded record.
+
+    Previews are rendered at ingestion and stored content-addressed, so the
+    ETag is the image digest and repeat requests with If-None-Match get a
+    304 without reading the file. Records uploaded before previews existed
+    are rendered on first request.
+
+    TODO: Implement database lookup for backfill
+    Steps to implement:
+    1. Verify user has access to this record
+    2. If no previews are stored, load file_path for the record:
+       supabase.table('medical_records')
+           .select('file_path')
+           .eq('id', record_id)
+           .eq('user_id', user_id)
+           .single()
+    3. If record or file not found, return 404 error
+    4. Files that cannot be rendered (corrupt, no pages) return 422
+    """
+
+    if size not in PREVIEW_SIZES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown preview size. Choose one of: {', '.join(PREVIEW_SIZES)}"
+        )
+
+    manifest = get_preview_manifest(record_id)
+    if manifest is None or size not in manifest or not os.path.exists(blob_path(manifest[size])):
+        file_path = _find_uploaded_file(record_id)
+        if file_path is None:
+            raise HTTPException(status_code=404, detail="Record file not found")
+        try:
+            manifest = await run_in_threadpool(render_previews, record_id, file_path)
+        except PreviewError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    digest = manifest[size]
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": PREVIEW_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(blob_path(digest), media_type=PREVIEW_MEDIA_TYPE, headers=headers)
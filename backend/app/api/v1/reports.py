@@ -1,6 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from app.api.dependencies import guard_ai_endpoint
 
 router = APIRouter()
 
@@ -36,7 +37,7 @@ class HealthTrend(BaseModel):
     forecast: float
     chart_data: List[Dict[str, Any]]
 
-@router.post("/reports/explain")
+@router.post("/reports/explain", dependencies=[Depends(guard_ai_endpoint)])
 async def explain_medical_report(data: ExplainRequest):
     """
     Generate simple explanation of medical report using AI.
@@ -52,9 +53,8 @@ async def explain_medical_report(data: ExplainRequest):
     4. Call Gemini API with structured prompt
     5. Parse AI response into structured format
     6. Calculate overall health score (0-100):
-       - Consider how many values are out of range
-       - Weight by importance of each test
-       - Apply risk factors
+       - Use score_record(parsed_data) from app.services.scoring so the
+         score matches the stored one and bulk rescoring
     7. Categorize findings as positive vs concerns
     8. Generate actionable next steps
     9. Store explanation in database for caching
@@ -74,13 +74,15 @@ async def explain_medical_report(data: ExplainRequest):
     4. Risk level assessment
     5. Recommended actions"
 
-    Health score calculation:
+    Health score calculation (ScoringRules):
     - Start at 100
-    - Subtract points for abnormal values:
-      - Minor deviation: -5 points
-      - Moderate: -15 points
+    - Subtract points for abnormal values, by distance outside the normal
+      range relative to its width:
+      - Minor deviation (up to 10%): -5 points
+      - Moderate (up to 25%): -15 points
       - Severe: -30 points
-    - Bonus for excellent values: +5 points
+    - Bonus for excellent values (near the middle of the range): +5 points
+    - After changing rules, run python -m app.jobs.rescore_records
     """
 
     return {
@@ -1,6 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from typing import List
+from app.api.dependencies import guard_ai_endpoint
 
 router = APIRouter()
 
@@ -26,7 +27,7 @@ class SymptomAssessment(BaseModel):
     warning_signs: List[str]
     when_to_seek_care: str
 
-@router.post("/symptoms/analyze", response_model=SymptomAssessment)
+@router.post("/symptoms/analyze", response_model=SymptomAssessment, dependencies=[Depends(guard_ai_endpoint)])
 async def analyze_symptoms(data: SymptomRequest):
     """
     Analyze symptoms using AI and provide assessment.
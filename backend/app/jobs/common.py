@@ -0,0 +1,16 @@
+import os
+
+
+def create_admin_client():
+    """
+    Create a Supabase client for admin jobs.
+
+    Jobs span every user's records, so they use the service role key rather
+    than the anon key used by the API.
+    """
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv()
+
+    return create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
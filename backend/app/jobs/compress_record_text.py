@@ -0,0 +1,85 @@
+"""
+Compress plain extracted_text of existing medical records.
+
+Rows written before compact storage keep their OCR text in extracted_text.
+This job reads them in id order, compresses the text into
+extracted_text_compressed and clears extracted_text, one
+compress_medical_record_text call per chunk. Finished rows no longer match
+the query, so an interrupted run simply picks up the remaining rows when
+started again.
+
+Run from the backend directory:
+    python -m app.jobs.compress_record_text --chunk-size 1000
+"""
+import argparse
+import time
+
+from app.jobs.common import create_admin_client
+from app.services.record_codec import compress_text, to_bytea
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def fetch_chunk(supabase, last_id, chunk_size: int) -> list:
+    query = (
+        supabase.table("medical_records")
+        .select("id, extracted_text")
+        .not_.is_("extracted_text", "null")
+        .order("id")
+        .limit(chunk_size)
+    )
+    if last_id is not None:
+        query = query.gt("id", last_id)
+    return query.execute().data
+
+
+def compress_chunk(rows: list) -> list:
+    """Build the compress_medical_record_text payload for fetched rows."""
+    return [
+        {
+            "id": row["id"],
+            "extracted_text_compressed": to_bytea(compress_text(row["extracted_text"]))
+        }
+        for row in rows
+    ]
+
+
+def run(supabase, chunk_size: int):
+    started = time.perf_counter()
+    last_id = None
+    processed = 0
+    raw_bytes = 0
+    compressed_bytes = 0
+    while True:
+        rows = fetch_chunk(supabase, last_id, chunk_size)
+        if not rows:
+            break
+
+        payload = compress_chunk(rows)
+        supabase.rpc("compress_medical_record_text", {"payload": payload}).execute()
+
+        last_id = rows[-1]["id"]
+        processed += len(rows)
+        raw_bytes += sum(len(row["extracted_text"].encode("utf-8")) for row in rows)
+        # Hex doubles the size on the wire; count the stored bytes.
+        compressed_bytes += sum((len(item["extracted_text_compressed"]) - 2) // 2 for item in payload)
+        print(f"Compressed {processed} records")
+
+    elapsed = time.perf_counter() - started
+    ratio = compressed_bytes / raw_bytes if raw_bytes else 0.0
+    print(
+        f"Done: {processed} records in {elapsed:.1f}s, "
+        f"{raw_bytes} -> {compressed_bytes} bytes ({ratio:.1%})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    run(create_admin_client(), args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
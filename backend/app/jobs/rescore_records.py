@@ -0,0 +1,143 @@
+"""
+Recompute status and overall_health_score for every medical record.
+
+Run after changing reference ranges or ScoringRules. Records are read in id
+order, scored in chunks with the vectorized scoring engine and written back
+with one rescore_medical_records call per chunk. Progress is checkpointed
+after each chunk, so an interrupted run resumes where it stopped; the
+checkpoint is removed when a run completes.
+
+Run from the backend directory:
+    python -m app.jobs.rescore_records --chunk-size 5000
+"""
+import argparse
+import json
+import os
+import time
+
+from app.jobs.common import create_admin_client
+from app.services.record_codec import decode_parsed_data
+from app.services.scoring import DEFAULT_RULES, flatten_records, score_batch
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_CHECKPOINT = os.path.join(os.getenv("STORAGE_DIR", "./data/storage"), "rescore_checkpoint.json")
+
+
+def load_checkpoint(path: str, rules_version: int) -> dict:
+    """Return saved progress for this rules version, or a fresh checkpoint."""
+    try:
+        with open(path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except (FileNotFoundError, ValueError):
+        checkpoint = None
+    if not checkpoint or checkpoint.get("scoring_version") != rules_version:
+        return {"scoring_version": rules_version, "last_id": None, "processed": 0}
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def fetch_chunk(supabase, last_id, chunk_size: int) -> list:
+    query = supabase.table("medical_records").select("id, parsed_data").order("id").limit(chunk_size)
+    if last_id is not None:
+        query = query.gt("id", last_id)
+    return query.execute().data
+
+
+def rescore_chunk(rows: list, rules=DEFAULT_RULES) -> list:
+    """
+    Score fetched rows and build the rescore_medical_records payload.
+
+    Rows whose parsed_data cannot be decoded are left unchanged, and records
+    with tests that could not be scored are scored on the rest; both are
+    reported by id instead of aborting the chunk.
+    """
+    decoded_rows = []
+    records = []
+    for row in rows:
+        try:
+            records.append(decode_parsed_data(row["parsed_data"] or {}))
+        except (ValueError, TypeError, AttributeError) as exc:
+            print(f"Skipping record {row['id']}: undecodable parsed_data ({exc})")
+            continue
+        decoded_rows.append(row)
+
+    batch = flatten_records(records)
+    for index in batch.unscorable:
+        print(f"Record {decoded_rows[index]['id']}: skipped tests with non-numeric values or ranges")
+
+    scores, statuses = score_batch(batch, rules)
+    return [
+        {
+            "id": row["id"],
+            "status": str(status),
+            "overall_health_score": int(score),
+            "scoring_version": rules.version
+        }
+        for row, score, status in zip(decoded_rows, scores, statuses)
+    ]
+
+
+def run(supabase, chunk_size: int, checkpoint_path: str, restart: bool = False):
+    rules = DEFAULT_RULES
+    checkpoint = load_checkpoint(checkpoint_path, rules.version)
+    if restart:
+        checkpoint = {"scoring_version": rules.version, "last_id": None, "processed": 0}
+    elif checkpoint["last_id"] is not None:
+        print(f"Resuming after {checkpoint['processed']} records (last id {checkpoint['last_id']})")
+
+    started = time.perf_counter()
+    processed_this_run = 0
+    while True:
+        rows = fetch_chunk(supabase, checkpoint["last_id"], chunk_size)
+        if not rows:
+            # A finished run must not be resumed: the next run (e.g. after
+            # reference ranges change) starts from the first record again.
+            clear_checkpoint(checkpoint_path)
+            break
+
+        chunk_started = time.perf_counter()
+        payload = rescore_chunk(rows, rules)
+        if payload:
+            supabase.rpc("rescore_medical_records", {"payload": payload}).execute()
+        chunk_seconds = time.perf_counter() - chunk_started
+
+        checkpoint["last_id"] = rows[-1]["id"]
+        checkpoint["processed"] += len(rows)
+        save_checkpoint(checkpoint_path, checkpoint)
+        processed_this_run += len(rows)
+        print(
+            f"Rescored {checkpoint['processed']} records "
+            f"({len(rows) / chunk_seconds:,.0f} records/sec this chunk)"
+        )
+
+    elapsed = time.perf_counter() - started
+    rate = processed_this_run / elapsed if elapsed else 0.0
+    print(f"Done: {processed_this_run} records in {elapsed:.1f}s ({rate:,.0f} records/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint")
+    args = parser.parse_args()
+
+    run(create_admin_client(), args.chunk_size, args.checkpoint, args.restart)
+
+
+if __name__ == "__main__":
+    main()
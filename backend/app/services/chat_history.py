@@ -0,0 +1,173 @@
+import base64
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_BUFFER_CAPACITY = 200
+DEFAULT_MAX_SESSIONS = 1000
+# Buffered sessions are dropped after this long so messages written by other
+# worker processes show up on the next read from the database.
+DEFAULT_BUFFER_TTL_SECONDS = 30.0
+
+CursorKey = Tuple[str, str]
+
+
+def encode_cursor(timestamp: str, message_id: str) -> str:
+    """Build an opaque pagination cursor from a message's (timestamp, id) key."""
+    raw = f"{timestamp}|{message_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """Parse a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    timestamp, sep, message_id = raw.partition("|")
+    if not sep or not timestamp or not message_id:
+        raise ValueError("Invalid cursor")
+    return timestamp, message_id
+
+
+def message_key(message: Dict[str, Any]) -> CursorKey:
+    return message["timestamp"], message["message_id"]
+
+
+def message_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a chat_messages row to a buffered message.
+
+    Buffered messages must carry the row's real id and created_at: cursors
+    built from buffered pages are used in the database keyset query on a
+    buffer miss.
+    """
+    return {
+        "message_id": str(row["id"]),
+        "timestamp": row["created_at"],
+        "role": row["role"],
+        "content": row["content"]
+    }
+
+
+class _SessionBuffer:
+    __slots__ = ("messages", "complete", "expires_at")
+
+    def __init__(self, capacity: int, complete: bool, expires_at: float):
+        self.messages: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        # True while the buffer holds the session's entire history, i.e. it
+        # was started from an empty session and has never overflowed.
+        self.complete = complete
+        self.expires_at = expires_at
+
+
+class ChatHistoryBuffer:
+    """
+    Per-session ring buffer of the most recent chat messages.
+
+    Serves newest-first history pages without touching the database as long
+    as the requested page lies inside the buffered window. Sessions are kept
+    in LRU order and the least recently used one is evicted once
+    max_sessions is exceeded.
+
+    The buffer is per process and only sees messages written by this
+    process, so a session expires ttl seconds after it was buffered and the
+    next read goes back to the database.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_BUFFER_CAPACITY,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl: float = DEFAULT_BUFFER_TTL_SECONDS
+    ):
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, _SessionBuffer]" = OrderedDict()
+
+    def _touch(self, session_id: str) -> Optional[_SessionBuffer]:
+        buffer = self._sessions.get(session_id)
+        if buffer is None:
+            return None
+        if buffer.expires_at <= time.monotonic():
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return buffer
+
+    def _create(self, session_id: str, complete: bool) -> _SessionBuffer:
+        buffer = _SessionBuffer(self.capacity, complete, time.monotonic() + self.ttl)
+        self._sessions[session_id] = buffer
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return buffer
+
+    def append(self, session_id: str, message: Dict[str, Any], new_session: bool = False):
+        """
+        Record a message that was just written for a session.
+
+        new_session marks a session created by this request, whose full
+        history is therefore known to be in the buffer.
+        """
+        buffer = self._touch(session_id) or self._create(session_id, complete=new_session)
+        if len(buffer.messages) == buffer.messages.maxlen:
+            buffer.complete = False
+        buffer.messages.append(message)
+
+    def load(self, session_id: str, messages: List[Dict[str, Any]], complete: bool):
+        """
+        Seed a session from a newest-first page read from the database.
+
+        complete should be True when the page contains the whole session.
+        Messages appended while the read was in flight are kept.
+        """
+        existing = self._touch(session_id)
+        merged = {message["message_id"]: message for message in messages}
+        if existing is not None:
+            for message in existing.messages:
+                merged.setdefault(message["message_id"], message)
+
+        buffer = self._create(session_id, complete=complete)
+        ordered = sorted(merged.values(), key=message_key)
+        if len(ordered) > self.capacity:
+            buffer.complete = False
+        buffer.messages.extend(ordered[-self.capacity:])
+
+    def page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[CursorKey] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Return (messages newest-first, next_cursor) for a session, or None
+        when the buffer cannot answer the page and the database must be used.
+        """
+        buffer = self._touch(session_id)
+        if buffer is None:
+            return None
+
+        page: List[Dict[str, Any]] = []
+        exhausted = True
+        for message in reversed(buffer.messages):
+            if before is not None and message_key(message) >= before:
+                continue
+            if len(page) == limit:
+                exhausted = False
+                break
+            page.append(message)
+
+        if len(page) < limit and not buffer.complete:
+            return None
+
+        has_more = not exhausted or not buffer.complete
+        next_cursor = encode_cursor(*message_key(page[-1])) if page and has_more else None
+        return page, next_cursor
+
+    def invalidate(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+
+chat_history_buffer = ChatHistoryBuffer()
@@ -0,0 +1,117 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+PREVIEW_SIZES = {
+    "small": 160,
+    "medium": 480,
+    "large": 1024
+}
+DEFAULT_PREVIEW_SIZE = "medium"
+PREVIEW_MEDIA_TYPE = "image/jpeg"
+PREVIEW_QUALITY = 80
+
+PREVIEW_DIR = os.path.join(os.getenv("STORAGE_DIR", "./data/storage"), "previews")
+_BLOB_DIR = os.path.join(PREVIEW_DIR, "blobs")
+_MANIFEST_DIR = os.path.join(PREVIEW_DIR, "records")
+
+
+class PreviewError(ValueError):
+    """The uploaded file could not be rendered (corrupt, empty or unsupported)."""
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def blob_path(digest: str) -> str:
+    """Location of a content-addressed preview, sharded by digest prefix."""
+    return os.path.join(_BLOB_DIR, digest[:2], f"{digest}.jpg")
+
+
+def _manifest_path(record_id: str) -> str:
+    return os.path.join(_MANIFEST_DIR, f"{record_id}.json")
+
+
+def _render_first_page(file_path: str):
+    """Rasterize the first page of a PDF, or load an image, as an RGB Pillow image."""
+    from PIL import Image, ImageOps
+
+    largest = max(PREVIEW_SIZES.values())
+    if file_path.lower().endswith(".pdf"):
+        import fitz
+
+        with fitz.open(file_path) as document:
+            if document.page_count == 0:
+                raise PreviewError("Document has no pages")
+            page = document[0]
+            zoom = largest / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+    with Image.open(file_path) as image:
+        image.draft("RGB", (largest, largest))
+        return ImageOps.exif_transpose(image).convert("RGB")
+
+
+def render_previews(record_id: str, file_path: str) -> Dict[str, str]:
+    """
+    Render first-page thumbnails of an uploaded record at every PREVIEW_SIZES
+    size and store them content-addressed on disk.
+
+    Returns the record's manifest mapping size name to content digest. This
+    is CPU bound; call it from a worker thread inside request handlers.
+    Raises PreviewError if the file cannot be rendered.
+    """
+    from PIL import Image
+
+    try:
+        page = _render_first_page(file_path)
+    except PreviewError:
+        raise
+    except (
+        OSError,
+        RuntimeError,
+        ValueError,
+        IndexError,
+        ZeroDivisionError,
+        Image.DecompressionBombError
+    ) as exc:
+        # PyMuPDF raises RuntimeError subclasses for corrupt documents,
+        # Pillow raises OSError (UnidentifiedImageError) for bad images and
+        # DecompressionBombError (not an OSError) for huge pixel dimensions.
+        raise PreviewError(f"Could not render preview: {exc}") from exc
+    manifest = {}
+    for name, size in sorted(PREVIEW_SIZES.items(), key=lambda item: -item[1]):
+        page.thumbnail((size, size))
+        buffer = io.BytesIO()
+        page.save(buffer, format="JPEG", quality=PREVIEW_QUALITY, optimize=True)
+        data = buffer.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(digest)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        manifest[name] = digest
+
+    _write_atomic(_manifest_path(record_id), json.dumps(manifest).encode("utf-8"))
+    return manifest
+
+
+def get_preview_manifest(record_id: str) -> Optional[Dict[str, str]]:
+    """Return the stored size -> digest manifest for a record, if rendered."""
+    try:
+        with open(_manifest_path(record_id), "rb") as manifest:
+            return json.load(manifest)
+    except (FileNotFoundError, ValueError):
+        return None
@@ -0,0 +1,173 @@
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-After takes whole seconds; round up so clients never retry early."""
+    return str(max(1, math.ceil(seconds)))
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets.
+
+    The in-memory backend limits per process. To share limits across
+    workers, implement take() and refund() on top of a shared store (e.g. a
+    Redis Lua script doing the same refill-and-take atomically) and pass it
+    to TokenBucketLimiter.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take cost tokens from key's bucket. Returns (allowed, retry_after_seconds)."""
+
+    @abstractmethod
+    async def refund(self, key: str, capacity: float, cost: float = 1.0):
+        """Return tokens taken for a request that was never served."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        # Least recently seen keys go first; an evicted key just starts
+        # again with a full bucket.
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / refill_per_second
+
+    async def refund(self, key: str, capacity: float, cost: float = 1.0):
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            tokens, updated = bucket
+            self._buckets[key] = (min(capacity, tokens + cost), updated)
+
+
+class TokenBucketLimiter:
+    """Allow `burst` requests at once per key, refilled at `per_minute` per minute."""
+
+    def __init__(self, per_minute: float, burst: int, backend: Optional[RateLimitBackend] = None):
+        self.capacity = float(burst)
+        self.refill_per_second = per_minute / 60.0
+        self.backend = backend or InMemoryRateLimitBackend()
+
+    async def check(self, key: str):
+        """Raise RateLimitExceeded if key has no tokens left."""
+        allowed, retry_after = await self.backend.take(key, self.capacity, self.refill_per_second)
+        if not allowed:
+            raise RateLimitExceeded(retry_after)
+
+    async def refund(self, key: str):
+        """Give back the token taken by check() when the request was not served."""
+        await self.backend.refund(key, self.capacity)
+
+
+class AdmissionController:
+    """
+    Bound the number of in-flight model calls.
+
+    Requests past max_concurrent wait in a queue of at most max_queued for
+    up to queue_timeout seconds. Requests are shed with Overloaded when the
+    queue is full, the wait times out, or event loop lag (sampled every
+    lag_interval seconds) exceeds max_loop_lag.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queued: int,
+        queue_timeout: float,
+        max_loop_lag: float,
+        lag_interval: float = 0.1
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.max_loop_lag = max_loop_lag
+        self.lag_interval = lag_interval
+        self.loop_lag = 0.0
+        self.outstanding = 0
+        self.queued = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._monitor: Optional[asyncio.Task] = None
+
+    def _start(self):
+        # Created on first use so they bind to the server's running loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.get_running_loop().create_task(self._watch_loop_lag())
+
+    async def close(self):
+        """Stop the loop lag monitor; call on application shutdown."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+
+    async def _watch_loop_lag(self):
+        while True:
+            expected = time.monotonic() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(0.0, time.monotonic() - expected)
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a model call slot for the duration of the block."""
+        self._start()
+        if self.loop_lag > self.max_loop_lag:
+            raise Overloaded("Server is overloaded", self.queue_timeout)
+
+        if self._semaphore.locked():
+            if self.queued >= self.max_queued:
+                raise Overloaded("Too many requests in progress", self.queue_timeout)
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise Overloaded("Timed out waiting for capacity", self.queue_timeout)
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.outstanding += 1
+        try:
+            yield
+        finally:
+            self.outstanding -= 1
+            self._semaphore.release()
@@ -0,0 +1,142 @@
+import zlib
+from typing import Any, Dict, List, Optional, Union
+
+TEXT_FORMAT_VERSION = 1
+PARSED_DATA_VERSION = 1
+
+# Preset DEFLATE dictionary for extracted report text. zlib favours matches
+# near the end of the dictionary, so the most common strings come last.
+# Dictionaries are immutable once shipped: add a new id rather than editing
+# one, or stored rows become undecodable.
+_LAB_REPORT_DICTIONARY_V1 = "\n".join([
+    "Sample Type: Serum Plasma Whole Blood EDTA Urine",
+    "Method: Photometry Immunoassay Calculated Flow Cytometry",
+    "Clinical correlation is advised. Please correlate clinically.",
+    "This is a computer generated report and does not require signature.",
+    "Pathologist Consultant MD Registration No. Verified by",
+    "Specimen Collected Received Reported Date Time",
+    "Patient Name: Age: Years Sex: Male Female Ref. By: Dr. Patient ID:",
+    "LIPID PROFILE Total Cholesterol Triglycerides HDL Cholesterol LDL Cholesterol VLDL Cholesterol",
+    "LIVER FUNCTION TEST Bilirubin Total Direct SGOT AST SGPT ALT Alkaline Phosphatase Albumin Globulin",
+    "KIDNEY FUNCTION TEST Urea Creatinine Uric Acid Sodium Potassium Chloride eGFR",
+    "THYROID PROFILE T3 T4 TSH uIU/mL ng/dL ug/dL",
+    "Glucose Fasting Postprandial HbA1c Random Blood Sugar %",
+    "COMPLETE BLOOD COUNT Hemoglobin RBC Count Hematocrit PCV MCV MCH MCHC RDW",
+    "Total Leucocyte Count Neutrophils Lymphocytes Monocytes Eosinophils Basophils Platelet Count",
+    "g/dL mg/dL mmol/L U/L IU/L fL pg cells/uL cells/µL million/uL lakhs/cumm 10^3/uL",
+    "Test Name Result Unit Biological Reference Interval Normal Range",
+    " High  Low  Normal  Borderline  Desirable ",
+]).encode("utf-8")
+
+_TEXT_DICTIONARIES = {
+    1: _LAB_REPORT_DICTIONARY_V1
+}
+CURRENT_TEXT_DICTIONARY = 1
+
+_STATUS_CODES = {"NORMAL": "N", "MONITOR": "M", "URGENT": "U"}
+_STATUS_NAMES = {code: name for name, code in _STATUS_CODES.items()}
+
+
+def compress_text(text: str, dictionary_id: int = CURRENT_TEXT_DICTIONARY) -> bytes:
+    """
+    Compress extracted report text for the extracted_text_compressed column.
+    Wrap the result in to_bytea() when writing it through Supabase.
+
+    The result is a two-byte header (format version, dictionary id) followed
+    by a raw DEFLATE stream primed with the lab report dictionary.
+    """
+    compressor = zlib.compressobj(
+        level=9,
+        wbits=-zlib.MAX_WBITS,
+        zdict=_TEXT_DICTIONARIES[dictionary_id]
+    )
+    body = compressor.compress(text.encode("utf-8")) + compressor.flush()
+    return bytes([TEXT_FORMAT_VERSION, dictionary_id]) + body
+
+
+def decompress_text(blob: bytes) -> str:
+    """Inverse of compress_text. Raises ValueError for unknown formats."""
+    if len(blob) < 2 or blob[0] != TEXT_FORMAT_VERSION or blob[1] not in _TEXT_DICTIONARIES:
+        raise ValueError("Unsupported extracted text encoding")
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS, zdict=_TEXT_DICTIONARIES[blob[1]])
+    return (decompressor.decompress(blob[2:]) + decompressor.flush()).decode("utf-8")
+
+
+def to_bytea(blob: bytes) -> str:
+    """
+    Format bytes for a bytea column written through supabase-py/PostgREST.
+
+    Request bodies are JSON, so bytes are sent in Postgres' hex input form.
+    """
+    return "\\x" + blob.hex()
+
+
+def from_bytea(value: Union[str, bytes]) -> bytes:
+    """Parse a bytea value read through PostgREST, which returns "\\x..." hex."""
+    if isinstance(value, bytes):
+        return value
+    if not value.startswith("\\x"):
+        raise ValueError("Unsupported bytea encoding")
+    return bytes.fromhex(value[2:])
+
+
+def stored_extracted_text(row: Dict[str, Any]) -> Optional[str]:
+    """
+    Return a medical_records row's OCR text from whichever column holds it.
+
+    Rows not yet rewritten by the compress_record_text job still have plain
+    extracted_text and a null extracted_text_compressed.
+    """
+    compressed = row.get("extracted_text_compressed")
+    if compressed:
+        return decompress_text(from_bytea(compressed))
+    return row.get("extracted_text")
+
+
+def encode_parsed_data(parsed_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pack parsed test values into the compact, versioned parsed_data form.
+
+    {"Hemoglobin": {"value": 12.5, "unit": "g/dL", "normal_range": [12, 16],
+    "status": "NORMAL"}} becomes
+    {"v": 1, "t": [["Hemoglobin", 12.5, "g/dL", 12, 16, "N"]]}.
+
+    Tests without a normal range (qualitative results, or values the parser
+    could not match to a range) are stored with null bounds.
+    """
+    tests: List[List[Any]] = []
+    for name, test in parsed_data.items():
+        low, high = test.get("normal_range") or (None, None)
+        status = test.get("status")
+        tests.append([
+            name,
+            test.get("value"),
+            test.get("unit"),
+            low,
+            high,
+            _STATUS_CODES.get(status, status)
+        ])
+    return {"v": PARSED_DATA_VERSION, "t": tests}
+
+
+def decode_parsed_data(stored: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Expand a stored parsed_data value back to the API shape.
+
+    Rows written before the compact encoding (no "v" key) pass through.
+    Tests stored without a normal range come back with normal_range None.
+    """
+    version = stored.get("v")
+    if not isinstance(version, int):
+        return stored
+    if version != PARSED_DATA_VERSION:
+        raise ValueError(f"Unsupported parsed_data version: {version}")
+    return {
+        name: {
+            "value": value,
+            "unit": unit,
+            "normal_range": None if low is None and high is None else [low, high],
+            "status": _STATUS_NAMES.get(status, status)
+        }
+        for name, value, unit, low, high, status in stored["t"]
+    }
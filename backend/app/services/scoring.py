@@ -0,0 +1,161 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RECORD_STATUSES = np.array(["NORMAL", "MONITOR", "URGENT"])
+
+_NORMAL, _MONITOR, _URGENT = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    """
+    Health score and status rules shared by uploads, report explanations and
+    the bulk rescoring job.
+
+    Deviation is measured as the distance outside the normal range divided
+    by the range width. Bump version whenever a threshold or weight changes
+    so stored scores can be told apart and recomputed.
+    """
+    version: int = 1
+    base_score: int = 100
+    minor_deviation: float = 0.10
+    moderate_deviation: float = 0.25
+    minor_penalty: int = 5
+    moderate_penalty: int = 15
+    severe_penalty: int = 30
+    # Values within this fraction of the range width from its midpoint count
+    # as excellent.
+    excellent_band: float = 0.25
+    excellent_bonus: int = 5
+
+
+DEFAULT_RULES = ScoringRules()
+
+
+@dataclass
+class TestBatch:
+    """
+    Test values from many records flattened into parallel arrays.
+
+    unscorable lists the indices of records that had at least one test
+    skipped because its value or normal range was missing or not numeric.
+    """
+    record_index: np.ndarray
+    values: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+    record_count: int
+    unscorable: List[int] = field(default_factory=list)
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _numeric_test(test: Any) -> Optional[Tuple[float, float, float]]:
+    """
+    Return (value, low, high) for a scorable test, else None. Inverted
+    ranges (low > high) are treated as bad data, not swapped.
+    """
+    if not isinstance(test, dict):
+        return None
+    normal_range = test.get("normal_range")
+    if not isinstance(normal_range, (list, tuple)) or len(normal_range) != 2:
+        return None
+    value, low, high = (_as_number(item) for item in (test.get("value"), *normal_range))
+    if value is None or low is None or high is None or low > high:
+        return None
+    return value, low, high
+
+
+def flatten_records(records: Sequence[Dict[str, Dict[str, Any]]]) -> TestBatch:
+    """
+    Flatten decoded parsed_data dicts into a TestBatch.
+
+    Historical parsed_data is not guaranteed to be clean, so qualitative
+    results (e.g. "Positive") and tests without a usable normal range are
+    skipped and their record flagged rather than failing the batch.
+    """
+    record_index: List[int] = []
+    values: List[float] = []
+    lows: List[float] = []
+    highs: List[float] = []
+    unscorable: List[int] = []
+    for index, parsed_data in enumerate(records):
+        tests = parsed_data.values() if isinstance(parsed_data, dict) else [parsed_data]
+        skipped = False
+        for test in tests:
+            numeric = _numeric_test(test)
+            if numeric is None:
+                skipped = True
+                continue
+            value, low, high = numeric
+            record_index.append(index)
+            values.append(value)
+            lows.append(low)
+            highs.append(high)
+        if skipped:
+            unscorable.append(index)
+    return TestBatch(
+        record_index=np.asarray(record_index, dtype=np.int64),
+        values=np.asarray(values, dtype=np.float64),
+        lows=np.asarray(lows, dtype=np.float64),
+        highs=np.asarray(highs, dtype=np.float64),
+        record_count=len(records),
+        unscorable=unscorable
+    )
+
+
+def score_batch(batch: TestBatch, rules: ScoringRules = DEFAULT_RULES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every record in a batch.
+
+    Returns (overall_health_score, status) arrays indexed like the records
+    passed to flatten_records. Records without tests score base_score and
+    are NORMAL. Results depend only on the inputs and rules.
+    """
+    range_width = batch.highs - batch.lows
+    # Zero-width ranges measure deviation in absolute units.
+    width = np.where(range_width > 0, range_width, 1.0)
+    outside = np.maximum(batch.lows - batch.values, 0) + np.maximum(batch.values - batch.highs, 0)
+    deviation = outside / width
+
+    level = np.where(
+        deviation == 0,
+        _NORMAL,
+        np.where(deviation > rules.moderate_deviation, _URGENT, _MONITOR)
+    )
+    penalty = np.select(
+        [
+            deviation == 0,
+            deviation <= rules.minor_deviation,
+            deviation <= rules.moderate_deviation
+        ],
+        [0, rules.minor_penalty, rules.moderate_penalty],
+        default=rules.severe_penalty
+    )
+    midpoint = (batch.lows + batch.highs) / 2
+    excellent = (deviation == 0) & (np.abs(batch.values - midpoint) <= rules.excellent_band * range_width)
+    adjustment = np.where(excellent, rules.excellent_bonus, -penalty)
+
+    totals = np.bincount(batch.record_index, weights=adjustment, minlength=batch.record_count)
+    scores = np.clip(rules.base_score + totals, 0, 100).astype(np.int64)
+
+    worst = np.zeros(batch.record_count, dtype=np.int64)
+    np.maximum.at(worst, batch.record_index, level)
+    return scores, RECORD_STATUSES[worst]
+
+
+def score_record(parsed_data: Dict[str, Dict[str, Any]], rules: ScoringRules = DEFAULT_RULES) -> Tuple[int, str]:
+    """Return (overall_health_score, status) for a single record."""
+    scores, statuses = score_batch(flatten_records([parsed_data]), rules)
+    return int(scores[0]), str(statuses[0])
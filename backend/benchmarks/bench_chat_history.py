@@ -0,0 +1,64 @@
+"""
+Benchmark chat history reads for a 10k-message session.
+
+Compares the buffered newest-first page against the previous approach of
+loading the whole conversation in ascending order on every read.
+
+Run from the backend directory:
+    python -m benchmarks.bench_chat_history
+"""
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.services.chat_history import ChatHistoryBuffer, decode_cursor
+
+SESSION_MESSAGES = 10_000
+PAGE_SIZE = 50
+ROUNDS = 2_000
+
+
+def build_session(count):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "message_id": str(uuid.uuid4()),
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"message {i}"
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    session_id = str(uuid.uuid4())
+    messages = build_session(SESSION_MESSAGES)
+
+    buffer = ChatHistoryBuffer()
+    for message in messages:
+        buffer.append(session_id, message)
+
+    def full_history():
+        return sorted(messages, key=lambda m: (m["timestamp"], m["message_id"]))[-PAGE_SIZE:]
+
+    def first_page():
+        return buffer.page(session_id, PAGE_SIZE)
+
+    _, cursor = first_page()
+    before = decode_cursor(cursor)
+
+    def second_page():
+        return buffer.page(session_id, PAGE_SIZE, before)
+
+    for name, fn in (
+        ("full history (baseline)", full_history),
+        ("buffered first page", first_page),
+        ("buffered second page", second_page),
+    ):
+        seconds = timeit.timeit(fn, number=ROUNDS) / ROUNDS
+        print(f"{name:<26} {seconds * 1e6:10.1f} us/read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark latency for well-behaved users under an abusive load mix.
+
+Simulates a model backend with fixed capacity. A few abusive clients send
+50 requests/sec each while well-behaved clients stay under the
+per-user rate limit. Reports well-behaved p50/p99 latency and outcome
+counts with no protection and with the rate limiter plus admission
+control used by the AI endpoints.
+
+Run from the backend directory:
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.rate_limit import (
+    AdmissionController,
+    Overloaded,
+    RateLimitExceeded,
+    TokenBucketLimiter
+)
+
+DURATION = 10.0
+MODEL_CAPACITY = 8
+MODEL_LATENCY = (0.15, 0.4)
+GOOD_CLIENTS = 40
+GOOD_INTERVAL = 4.0
+ABUSIVE_CLIENTS = 3
+ABUSIVE_RATE = 50.0
+
+
+class Model:
+    def __init__(self, rng):
+        self.rng = rng
+        self.slots = asyncio.Semaphore(MODEL_CAPACITY)
+
+    async def call(self):
+        async with self.slots:
+            await asyncio.sleep(self.rng.uniform(*MODEL_LATENCY))
+
+
+async def run(protected: bool):
+    rng = random.Random(1)
+    model = Model(rng)
+    limiter = TokenBucketLimiter(per_minute=20, burst=5)
+    admission = AdmissionController(
+        max_concurrent=MODEL_CAPACITY,
+        max_queued=MODEL_CAPACITY * 2,
+        queue_timeout=2.0,
+        max_loop_lag=0.2
+    )
+    results = {"good": [], "rejected_good": 0, "abusive_ok": 0, "abusive_rejected": 0}
+
+    async def request(key):
+        if protected:
+            await limiter.check(key)
+            try:
+                async with admission.admit():
+                    await model.call()
+            except Overloaded:
+                await limiter.refund(key)
+                raise
+        else:
+            await model.call()
+
+    async def good_request(key):
+        started = time.perf_counter()
+        try:
+            await request(key)
+        except (RateLimitExceeded, Overloaded):
+            results["rejected_good"] += 1
+            return
+        results["good"].append(time.perf_counter() - started)
+
+    async def abusive_request(key):
+        try:
+            await request(key)
+            results["abusive_ok"] += 1
+        except (RateLimitExceeded, Overloaded):
+            results["abusive_rejected"] += 1
+
+    async def client(key, interval, handler):
+        tasks = []
+        deadline = time.perf_counter() + DURATION
+        await asyncio.sleep(rng.uniform(0, interval))
+        while time.perf_counter() < deadline:
+            tasks.append(asyncio.create_task(handler(key)))
+            await asyncio.sleep(rng.expovariate(1 / interval))
+        await asyncio.gather(*tasks)
+
+    await asyncio.gather(
+        *(client(f"good-{i}", GOOD_INTERVAL, good_request) for i in range(GOOD_CLIENTS)),
+        *(client(f"abusive-{i}", 1 / ABUSIVE_RATE, abusive_request) for i in range(ABUSIVE_CLIENTS))
+    )
+    return results
+
+
+def report(name, results):
+    latencies = sorted(results["good"])
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<12} good p50 {p50 * 1000:7.0f} ms  p99 {p99 * 1000:7.0f} ms  "
+        f"good served {len(latencies)} rejected {results['rejected_good']}  "
+        f"abusive served {results['abusive_ok']} rejected {results['abusive_rejected']}"
+    )
+
+
+def main():
+    report("unprotected", asyncio.run(run(protected=False)))
+    report("protected", asyncio.run(run(protected=True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark record storage encodings on a synthetic lab report corpus.
+
+Reports the size of extracted_text and parsed_data before and after
+encoding, and per-record decode latency.
+
+Run from the backend directory:
+    python -m benchmarks.bench_record_codec
+"""
+import json
+import random
+import timeit
+import zlib
+
+from app.services.record_codec import (
+    compress_text,
+    decode_parsed_data,
+    decompress_text,
+    encode_parsed_data
+)
+
+CORPUS_SIZE = 1_000
+ROUNDS = 20
+
+TESTS = [
+    ("Hemoglobin", "g/dL", 12.0, 16.0),
+    ("Total Leucocyte Count", "cells/µL", 4000, 11000),
+    ("Platelet Count", "lakhs/cumm", 1.5, 4.1),
+    ("Hematocrit", "%", 36.0, 46.0),
+    ("MCV", "fL", 80.0, 100.0),
+    ("Total Cholesterol", "mg/dL", 0, 200),
+    ("Triglycerides", "mg/dL", 0, 150),
+    ("HDL Cholesterol", "mg/dL", 40, 60),
+    ("LDL Cholesterol", "mg/dL", 0, 100),
+    ("Creatinine", "mg/dL", 0.6, 1.2),
+    ("Urea", "mg/dL", 15, 40),
+    ("SGPT ALT", "U/L", 7, 56),
+    ("TSH", "uIU/mL", 0.4, 4.0),
+    ("Glucose Fasting", "mg/dL", 70, 100),
+    ("HbA1c", "%", 4.0, 5.6),
+]
+
+
+def build_record(rng):
+    tests = rng.sample(TESTS, rng.randint(5, len(TESTS)))
+    parsed_data = {}
+    lines = [
+        "Patient Name: Patient {} Age: {} Years Sex: {}".format(
+            rng.randint(1, 10_000), rng.randint(18, 90), rng.choice(["Male", "Female"])
+        ),
+        "Specimen Collected 2024-{:02d}-{:02d} Received Reported".format(
+            rng.randint(1, 12), rng.randint(1, 28)
+        ),
+        "Sample Type: Serum   Method: Photometry",
+        "Test Name Result Unit Biological Reference Interval",
+    ]
+    for name, unit, low, high in tests:
+        value = round(rng.uniform(low * 0.7, high * 1.3), 1)
+        status = "NORMAL" if low <= value <= high else rng.choice(["MONITOR", "URGENT"])
+        parsed_data[name] = {
+            "value": value,
+            "unit": unit,
+            "normal_range": [low, high],
+            "status": status
+        }
+        flag = "" if status == "NORMAL" else ("High" if value > high else "Low")
+        lines.append(f"{name} {value} {flag} {unit} {low} - {high}")
+    lines += [
+        "Clinical correlation is advised.",
+        "This is a computer generated report and does not require signature.",
+        "Pathologist Consultant MD Registration No. {}".format(rng.randint(10_000, 99_999)),
+    ]
+    return "\n".join(lines), parsed_data
+
+
+def main():
+    rng = random.Random(42)
+    corpus = [build_record(rng) for _ in range(CORPUS_SIZE)]
+
+    raw_text = sum(len(text.encode("utf-8")) for text, _ in corpus)
+    plain_zlib = sum(len(zlib.compress(text.encode("utf-8"), 9)) for text, _ in corpus)
+    compressed = [compress_text(text) for text, _ in corpus]
+    dict_zlib = sum(len(blob) for blob in compressed)
+
+    raw_parsed = sum(len(json.dumps(parsed)) for _, parsed in corpus)
+    encoded = [encode_parsed_data(parsed) for _, parsed in corpus]
+    compact_parsed = sum(len(json.dumps(stored)) for stored in encoded)
+
+    print(f"records: {CORPUS_SIZE}")
+    print(f"extracted_text raw          {raw_text:>10} bytes")
+    print(f"extracted_text zlib         {plain_zlib:>10} bytes ({plain_zlib / raw_text:.1%})")
+    print(f"extracted_text zlib + dict  {dict_zlib:>10} bytes ({dict_zlib / raw_text:.1%})")
+    print(f"parsed_data json            {raw_parsed:>10} bytes")
+    print(f"parsed_data compact v1      {compact_parsed:>10} bytes ({compact_parsed / raw_parsed:.1%})")
+
+    text_seconds = timeit.timeit(
+        lambda: [decompress_text(blob) for blob in compressed], number=ROUNDS
+    ) / ROUNDS / CORPUS_SIZE
+    parsed_seconds = timeit.timeit(
+        lambda: [decode_parsed_data(stored) for stored in encoded], number=ROUNDS
+    ) / ROUNDS / CORPUS_SIZE
+    print(f"decompress_text             {text_seconds * 1e6:10.1f} us/record")
+    print(f"decode_parsed_data          {parsed_seconds * 1e6:10.1f} us/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
+import os
+from dotenv import load_dotenv
+
+# Load .env before importing app modules: rate limit, admission control and
+# storage settings are read from the environment at import time.
+load_dotenv()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.dependencies import ai_admission
 from app.api.v1 import symptom_checker, records, reports, chat, dashboard
 
 app = FastAPI(
@@ -14,6 +22,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 app.include_router(symptom_checker.router, prefix="/api/v1", tags=["Symptom Checker"])
@@ -22,6 +31,10 @@ app.include_router(reports.router, prefix="/api/v1", tags=["Reports"])
 app.include_router(chat.router, prefix="/api/v1", tags=["Chat"])
 app.include_router(dashboard.router, prefix="/api/v1", tags=["Dashboard"])
 
+@app.on_event("shutdown")
+async def shutdown():
+    await ai_admission.close()
+
 @app.get("/")
 async def root():
     return {
@@ -36,4 +49,10 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    )
@@ -0,0 +1,74 @@
+import pytest
+
+from app.services.chat_history import ChatHistoryBuffer, decode_cursor, encode_cursor
+
+
+def message(i):
+    return {"message_id": f"m{i:03d}", "timestamp": f"2024-10-25T10:00:{i:02d}+00:00", "role": "user", "content": str(i)}
+
+
+def ids(page):
+    return [item["message_id"] for item in page]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("2024-10-25T10:00:00+00:00", "m001")) == ("2024-10-25T10:00:00+00:00", "m001")
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_pages_newest_first_with_exact_limit_last_page():
+    buffer = ChatHistoryBuffer(capacity=10)
+    for i in range(4):
+        buffer.append("s", message(i), new_session=True)
+
+    page, cursor = buffer.page("s", 2)
+    assert ids(page) == ["m003", "m002"]
+    assert cursor is not None
+
+    page, cursor = buffer.page("s", 2, decode_cursor(cursor))
+    assert ids(page) == ["m001", "m000"]
+    assert cursor is None
+
+
+def test_cursor_outside_buffered_window_misses():
+    buffer = ChatHistoryBuffer(capacity=10)
+    buffer.load("s", [message(i) for i in range(9, 4, -1)], complete=False)
+
+    page, cursor = buffer.page("s", 5)
+    assert ids(page) == ["m009", "m008", "m007", "m006", "m005"]
+    assert cursor is not None
+    assert buffer.page("s", 5, decode_cursor(cursor)) is None
+
+
+def test_overflow_clears_complete():
+    buffer = ChatHistoryBuffer(capacity=3)
+    for i in range(3):
+        buffer.append("s", message(i), new_session=True)
+    assert ids(buffer.page("s", 5)[0]) == ["m002", "m001", "m000"]
+
+    buffer.append("s", message(3))
+    assert buffer.page("s", 5) is None
+    page, cursor = buffer.page("s", 3)
+    assert ids(page) == ["m003", "m002", "m001"]
+    assert cursor is not None
+
+
+def test_unknown_session_misses():
+    assert ChatHistoryBuffer().page("missing", 10) is None
+
+
+def test_load_keeps_messages_appended_during_read():
+    buffer = ChatHistoryBuffer(capacity=10)
+    buffer.append("s", message(2))
+    buffer.load("s", [message(1), message(0)], complete=True)
+    assert ids(buffer.page("s", 10)[0]) == ["m002", "m001", "m000"]
+
+
+def test_expired_session_misses():
+    buffer = ChatHistoryBuffer(ttl=0)
+    buffer.append("s", message(0), new_session=True)
+    assert buffer.page("s", 10) is None
@@ -0,0 +1,97 @@
+import hashlib
+
+import pytest
+
+from app.services import record_codec
+from app.services.record_codec import (
+    compress_text,
+    decode_parsed_data,
+    decompress_text,
+    encode_parsed_data,
+    from_bytea,
+    stored_extracted_text,
+    to_bytea
+)
+
+REPORT_TEXT = (
+    "COMPLETE BLOOD COUNT\n"
+    "Hemoglobin 12.5 g/dL 12.0 - 16.0\n"
+    "Platelet Count 2.5 lakhs/cumm\n"
+    "Clinical correlation is advised."
+)
+# compress_text(REPORT_TEXT) as stored with dictionary 1. It is made almost
+# entirely of back-references into the dictionary, so any edit to
+# _LAB_REPORT_DICTIONARY_V1 breaks decoding of this (and every stored) row.
+STORED_REPORT_TEXT = (
+    "\\x0101c316c65c48616c68a467aa00f61b9065a0a0ab6068a667c0851a020a2035086f102c5700"
+)
+DICTIONARY_V1_SHA256 = "916af1545bbc8e3968805eabbf143fe872c18a994cd219a25e24347b10f61d64"
+
+
+def test_text_round_trip():
+    text = REPORT_TEXT + "\nNotes: répéter le test µ"
+    assert decompress_text(compress_text(text)) == text
+
+
+def test_bytea_round_trip():
+    blob = compress_text(REPORT_TEXT)
+    encoded = to_bytea(blob)
+    assert encoded.startswith("\\x")
+    assert from_bytea(encoded) == blob
+    assert from_bytea(blob) == blob
+
+
+def test_stored_text_decodes_with_shipped_dictionary():
+    assert decompress_text(from_bytea(STORED_REPORT_TEXT)) == REPORT_TEXT
+
+
+def test_dictionary_v1_is_unchanged():
+    # Dictionaries are immutable once shipped; add a new id instead.
+    assert hashlib.sha256(record_codec._TEXT_DICTIONARIES[1]).hexdigest() == DICTIONARY_V1_SHA256
+
+
+def test_unknown_text_encoding_rejected():
+    with pytest.raises(ValueError):
+        decompress_text(b"\x02\x01abc")
+    with pytest.raises(ValueError):
+        decompress_text(b"\x01\x63abc")
+    with pytest.raises(ValueError):
+        from_bytea("plain text")
+
+
+def test_stored_extracted_text_falls_back_to_plain_column():
+    assert stored_extracted_text({"extracted_text": "legacy", "extracted_text_compressed": None}) == "legacy"
+    assert stored_extracted_text({"extracted_text": None, "extracted_text_compressed": STORED_REPORT_TEXT}) == REPORT_TEXT
+
+
+def test_parsed_data_round_trip():
+    parsed_data = {
+        "Hemoglobin": {"value": 12.5, "unit": "g/dL", "normal_range": [12.0, 16.0], "status": "NORMAL"},
+        "Total Cholesterol": {"value": 220, "unit": "mg/dL", "normal_range": [0, 200], "status": "MONITOR"},
+    }
+    encoded = encode_parsed_data(parsed_data)
+    assert encoded["v"] == 1
+    assert encoded["t"][0] == ["Hemoglobin", 12.5, "g/dL", 12.0, 16.0, "N"]
+    assert decode_parsed_data(encoded) == parsed_data
+
+
+def test_missing_normal_range_round_trips_as_none():
+    parsed_data = {
+        "HIV": {"value": "Negative", "unit": "", "status": "NORMAL"},
+        "Culture": {"value": "No growth", "unit": "", "normal_range": None, "status": "NORMAL"},
+    }
+    encoded = encode_parsed_data(parsed_data)
+    assert encoded["t"][0][3:5] == [None, None]
+    decoded = decode_parsed_data(encoded)
+    assert decoded["HIV"]["normal_range"] is None
+    assert decoded["Culture"] == parsed_data["Culture"]
+
+
+def test_legacy_parsed_data_passes_through():
+    legacy = {"Hemoglobin": {"value": 12.5, "unit": "g/dL", "normal_range": [12.0, 16.0], "status": "NORMAL"}}
+    assert decode_parsed_data(legacy) is legacy
+
+
+def test_unknown_parsed_data_version_rejected():
+    with pytest.raises(ValueError):
+        decode_parsed_data({"v": 2, "t": []})
@@ -0,0 +1,74 @@
+import pytest
+
+from app.services.scoring import flatten_records, score_batch, score_record
+
+
+def hemoglobin(value, normal_range=(12.0, 16.0)):
+    return {"Hemoglobin": {"value": value, "unit": "g/dL", "normal_range": list(normal_range), "status": "NORMAL"}}
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (13.0, (100, "NORMAL")),
+        (16.3, (95, "MONITOR")),
+        (17.0, (85, "MONITOR")),
+        (30.0, (70, "URGENT")),
+    ],
+)
+def test_deviation_rules(value, expected):
+    assert score_record(hemoglobin(value)) == expected
+
+
+def test_excellent_bonus_offsets_penalty():
+    parsed_data = {
+        **hemoglobin(16.3),
+        "Glucose Fasting": {"value": 85, "unit": "mg/dL", "normal_range": [70, 100], "status": "NORMAL"},
+    }
+    assert score_record(parsed_data) == (100, "MONITOR")
+
+
+def test_zero_width_range():
+    assert score_record(hemoglobin(5.0, (5.0, 5.0))) == (100, "NORMAL")
+    assert score_record(hemoglobin(5.2, (5.0, 5.0))) == (85, "MONITOR")
+    assert score_record(hemoglobin(0.1, (0.0, 0.0))) == (95, "MONITOR")
+    assert score_record(hemoglobin(6.0, (5.0, 5.0))) == (70, "URGENT")
+
+
+def test_excellent_bonus_only_applies_in_range():
+    parsed_data = {
+        **hemoglobin(30.0),
+        "Glucose Fasting": {"value": 85, "unit": "mg/dL", "normal_range": [70, 100], "status": "NORMAL"},
+    }
+    assert score_record(parsed_data) == (75, "URGENT")
+
+
+def test_inverted_range_is_unscorable():
+    batch = flatten_records([hemoglobin(14.0, (16.0, 12.0))])
+    scores, statuses = score_batch(batch)
+    assert batch.unscorable == [0]
+    assert (scores.tolist(), statuses.tolist()) == ([100], ["NORMAL"])
+
+
+def test_record_without_tests_is_normal():
+    assert score_record({}) == (100, "NORMAL")
+
+
+def test_unscorable_tests_are_skipped_and_flagged():
+    records = [
+        hemoglobin(30.0),
+        {**hemoglobin(16.3), "HIV": {"value": "Positive", "unit": "", "normal_range": [0, 0], "status": "URGENT"}},
+        {"Culture": {"value": 1.0, "unit": "", "status": "NORMAL"}},
+    ]
+    batch = flatten_records(records)
+    scores, statuses = score_batch(batch)
+
+    assert batch.unscorable == [1, 2]
+    assert scores.tolist() == [70, 95, 100]
+    assert statuses.tolist() == ["URGENT", "MONITOR", "NORMAL"]
+
+
+def test_batch_matches_single_record_scoring():
+    records = [hemoglobin(value) for value in (13.0, 16.3, 17.0, 30.0, 8.0)]
+    scores, statuses = score_batch(flatten_records(records))
+    assert list(zip(scores.tolist(), statuses.tolist())) == [score_record(record) for record in records]
@@ -147,7 +147,9 @@ export default function ReportDetail() {
                                 {data.value} {data.unit}
                               </td>
                               <td className="px-4 py-3 text-sm text-gray-600">
-                                {data.normal_range[0]} - {data.normal_range[1]} {data.unit}
+                                {data.normal_range
+                                  ? `${data.normal_range[0]} - ${data.normal_range[1]} ${data.unit}`
+                                  : '—'}
                               </td>
                               <td className="px-4 py-3">
                                 <SeverityBadge level={data.status} />
@@ -7,7 +7,7 @@ import type {
   ReportExplanation,
   HealthTrend,
   ChatResponse,
-  ChatMessage,
+  ChatHistory,
   DashboardStats,
 } from '../types';
 
@@ -51,11 +51,14 @@ export const getMedicalRecords = async (params?: {
   return response.data;
 };
 
-export const getRecordDetails = async (recordId: string): Promise<RecordDetails> => {
-  const response = await apiClient.get(`/records/${recordId}`);
+export const getRecordDetails = async (recordId: string, params?: { include?: 'text' }): Promise<RecordDetails> => {
+  const response = await apiClient.get(`/records/${recordId}`, { params });
   return response.data;
 };
 
+export const getRecordPreviewUrl = (recordId: string, size: 'small' | 'medium' | 'large' = 'medium'): string =>
+  `${API_BASE_URL}/records/${recordId}/preview?size=${size}`;
+
 export const explainReport = async (recordId: string): Promise<{ explanation: ReportExplanation }> => {
   const response = await apiClient.post('/reports/explain', { record_id: recordId });
   return response.data;
@@ -71,8 +74,14 @@ export const askQuestion = async (question: string, sessionId?: string): Promise
   return response.data;
 };
 
-export const getChatHistory = async (sessionId: string): Promise<{ session_id: string; messages: ChatMessage[] }> => {
-  const response = await apiClient.get(`/chat/history/${sessionId}`);
+export const getChatHistory = async (
+  sessionId: string,
+  params?: {
+    limit?: number;
+    before?: string;
+  }
+): Promise<ChatHistory> => {
+  const response = await apiClient.get(`/chat/history/${sessionId}`, { params });
   return response.data;
 };
 
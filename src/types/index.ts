@@ -36,7 +36,7 @@ export interface ParsedTestData {
   [testName: string]: {
     value: number;
     unit: string;
-    normal_range: [number, number];
+    normal_range: [number, number] | null;
     status: 'NORMAL' | 'HIGH' | 'LOW';
   };
 }
@@ -46,7 +46,7 @@ export interface RecordDetails {
   record_type: string;
   report_date: string;
   lab_name: string;
-  extracted_text: string;
+  extracted_text?: string | null;
   parsed_data: ParsedTestData;
   analysis: {
     simple_explanation: string;
@@ -85,11 +85,18 @@ export interface HealthTrend {
 }
 
 export interface ChatMessage {
+  message_id?: string;
   timestamp: string;
   role: 'user' | 'assistant';
   content: string;
 }
 
+export interface ChatHistory {
+  session_id: string;
+  messages: ChatMessage[];
+  next_cursor: string | null;
+}
+
 export interface ChatResponse {
   answer: string;
   referenced_records: string[];
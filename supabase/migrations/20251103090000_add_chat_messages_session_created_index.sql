@@ -0,0 +1,18 @@
+/*
+  # Index chat history by session and recency
+
+  ## Overview
+  Chat history is read newest-first in cursor pages keyed on
+  (created_at, id). The composite index lets each page be served as an
+  index range scan instead of sorting the whole session.
+
+  ## Changes
+  - Add `idx_chat_messages_session_created` on
+    chat_messages(session_id, created_at DESC, id DESC)
+  - Drop `idx_chat_messages_session_id`, which the new index covers
+*/
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created
+  ON chat_messages(session_id, created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_chat_messages_session_id;
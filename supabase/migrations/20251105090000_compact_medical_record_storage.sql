@@ -0,0 +1,23 @@
+/*
+  # Compact storage for medical record text and parsed values
+
+  ## Overview
+  OCR text and parsed test values make up most of medical_records. Text is
+  now stored DEFLATE-compressed with a preset lab report dictionary, and
+  parsed_data uses a compact versioned layout ({"v": 1, "t": [[...]]}).
+  Both encodings are produced and read by app/services/record_codec.py.
+
+  ## Changes
+  - Add `extracted_text_compressed` (bytea) to medical_records
+  - Keep `extracted_text` for existing rows until they are rewritten
+    through compress_text
+  - Rows whose parsed_data has no "v" key are still read as the original
+    name-keyed object
+*/
+
+ALTER TABLE medical_records
+  ADD COLUMN IF NOT EXISTS extracted_text_compressed BYTEA;
+
+-- Compressed blobs are already dense; skip TOAST's own pglz pass.
+ALTER TABLE medical_records
+  ALTER COLUMN extracted_text_compressed SET STORAGE EXTERNAL;
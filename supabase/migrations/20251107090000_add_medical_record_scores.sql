@@ -0,0 +1,40 @@
+/*
+  # Stored health scores and bulk rescoring
+
+  ## Overview
+  Health score and status are computed by the scoring engine
+  (app/services/scoring.py). Storing the score with the rules version that
+  produced it lets the rescoring job recompute every record when reference
+  ranges or weights change.
+
+  ## Changes
+  - Add `overall_health_score` and `scoring_version` to medical_records
+  - Add `rescore_medical_records(payload jsonb)`, which applies a chunk of
+    {id, status, overall_health_score, scoring_version} rows in one UPDATE.
+    It is restricted to the service role used by the rescoring job.
+*/
+
+ALTER TABLE medical_records
+  ADD COLUMN IF NOT EXISTS overall_health_score INTEGER
+    CHECK (overall_health_score >= 0 AND overall_health_score <= 100),
+  ADD COLUMN IF NOT EXISTS scoring_version INTEGER;
+
+CREATE OR REPLACE FUNCTION rescore_medical_records(payload JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  updated INTEGER;
+BEGIN
+  UPDATE medical_records AS m
+  SET status = r.status,
+      overall_health_score = r.overall_health_score,
+      scoring_version = r.scoring_version
+  FROM jsonb_to_recordset(payload)
+    AS r(id UUID, status TEXT, overall_health_score INTEGER, scoring_version INTEGER)
+  WHERE m.id = r.id;
+  GET DIAGNOSTICS updated = ROW_COUNT;
+  RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION rescore_medical_records(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rescore_medical_records(JSONB) TO service_role;
@@ -0,0 +1,34 @@
+/*
+  # Backfill compressed record text
+
+  ## Overview
+  Rows written before compact storage still hold plain `extracted_text`.
+  The compress_record_text job (app/jobs/compress_record_text.py) compresses
+  them in chunks and writes each chunk back through this function, which
+  stores the compressed text and clears the plain column so storage
+  actually shrinks.
+
+  ## Changes
+  - Add `compress_medical_record_text(payload jsonb)`, applying a chunk of
+    {id, extracted_text_compressed} rows (bytea in "\x..." hex form) in one
+    UPDATE. It is restricted to the service role used by admin jobs.
+*/
+
+CREATE OR REPLACE FUNCTION compress_medical_record_text(payload JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  updated INTEGER;
+BEGIN
+  UPDATE medical_records AS m
+  SET extracted_text_compressed = r.extracted_text_compressed,
+      extracted_text = NULL
+  FROM jsonb_to_recordset(payload)
+    AS r(id UUID, extracted_text_compressed BYTEA)
+  WHERE m.id = r.id;
+  GET DIAGNOSTICS updated = ROW_COUNT;
+  RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION compress_medical_record_text(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION compress_medical_record_text(JSONB) TO service_role;